@@ -1,4 +1,5 @@
-from .collector import Collector, collect, selectBookmark, selectKeyword, selectRanking, selectUser
+import importlib
+
 from .config import (
     debug_config,
     displayAllConfig,
@@ -7,10 +8,27 @@ from .config import (
     ranking_config,
     user_config,
 )
-from .crawlers import BookmarkCrawler, KeywordCrawler, RankingCrawler, UserCrawler, PrivateBookmarkCrawler
-from .downloader import Downloader, downloadImage
 from .utils import assertError, assertWarn, checkDir, printInfo, writeFailLog
 
+# Lazy re-exports (PEP 562): config/utils are cheap and stay eager, while
+# the collector/downloader/crawler stacks (requests, bs4, tqdm) only load
+# when one of their names is first used
+_LAZY_MODULES = {
+    "Collector": ".collector",
+    "collect": ".collector",
+    "selectBookmark": ".collector",
+    "selectKeyword": ".collector",
+    "selectRanking": ".collector",
+    "selectUser": ".collector",
+    "Downloader": ".downloader",
+    "downloadImage": ".downloader",
+    "BookmarkCrawler": ".crawlers",
+    "PrivateBookmarkCrawler": ".crawlers",
+    "KeywordCrawler": ".crawlers",
+    "RankingCrawler": ".crawlers",
+    "UserCrawler": ".crawlers",
+}
+
 __all__ = [
     "user_config",
     "ranking_config",
@@ -37,3 +55,15 @@ __all__ = [
     "RankingCrawler",
     "UserCrawler",
 ]
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return getattr(importlib.import_module(module_name, __name__), name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
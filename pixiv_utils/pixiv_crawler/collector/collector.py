@@ -1,8 +1,8 @@
+import collections
 import concurrent.futures as futures
 import functools
-import json
-import os
-from typing import Dict, Iterable, List, Set, Callable
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import tqdm
 
@@ -10,8 +10,95 @@ from pixiv_utils.pixiv_crawler.config import download_config, user_config
 from pixiv_utils.pixiv_crawler.downloader import Downloader
 from pixiv_utils.pixiv_crawler.utils import printInfo
 
-from .collector_unit import collect
-from .selectors import selectPage, selectMetadata
+from . import metadata_store
+from .collector_unit import calibratePoolSize, collect, collectPoolSize
+from .selectors import selectMetadata, selectPage
+
+PAGES_KIND = "pages.json"
+METADATA_KIND = "metadata.json"
+
+# Constant url/header parts, hoisted out of the per-id request builders
+_PAGES_URL_PREFIX = "https://www.pixiv.net/ajax/illust/"
+_PAGES_URL_SUFFIX = "/pages?lang=zh"
+_ARTWORK_URL_PREFIX = "https://www.pixiv.net/artworks/"
+_METADATA_HEADERS = {"Referer": "https://www.pixiv.net/bookmark.php?type=user"}
+
+# Flush the progress bar at most once per this many artworks or seconds;
+# per-completion updates re-render the terminal for every future
+_PBAR_FLUSH_COUNT = 64
+_PBAR_FLUSH_INTERVAL = 0.2
+
+# Number of requests run inline as a latency probe before fanning out
+_PROBE_SIZE = 8
+
+# Selector callbacks bound once at module load instead of per submit
+_collectPage = functools.partial(collect, selector=selectPage)
+_collectMetadata = functools.partial(collect, selector=selectMetadata)
+
+
+def _batchSize(num_requests: int) -> int:
+    """
+    Batch size that keeps the thread pool saturated.
+
+    Requests inside a batch run serially on one worker (each paying
+    thread_delay), so there must always be far more pending batches than
+    workers; download_config.batch_size only caps the upper bound reached
+    on very large crawls.
+    """
+    return max(1, min(download_config.batch_size, num_requests // (collectPoolSize() * 4)))
+
+
+def _loadCachedPages(illust_id: str) -> Optional[Set[str]]:
+    """
+    Load previously collected page urls of an artwork, if stored.
+
+    Returns:
+        Optional[Set[str]]: cached image urls, or None on cache miss
+    """
+    urls = metadata_store.loadData(illust_id, PAGES_KIND)
+    return set(urls) if urls is not None else None
+
+
+def _collectPageBatch(request_batch: List[Tuple[str, str, Dict]]) -> Set[str]:
+    """
+    Collect page urls for a batch of artworks on one worker thread.
+
+    Pixiv has no multi-id pages endpoint, so the batch is fetched request by
+    request over the shared keep-alive session; batching amortizes future
+    scheduling overhead when id_group is large.
+
+    Args:
+        request_batch: (illust_id, url, additional_headers) triples.
+
+    Returns:
+        Set[str]: image urls of the whole batch
+    """
+    urls: Set[str] = set()
+    for illust_id, url, additional_headers in request_batch:
+        page_urls = _collectPage(url, additional_headers=additional_headers)
+        if page_urls is not None:
+            # NOTE: url_only runs must leave store_path untouched
+            if not download_config.url_only:
+                metadata_store.enqueueSave(illust_id, PAGES_KIND, sorted(page_urls))
+            urls.update(page_urls)
+    return urls
+
+
+def _collectMetadataBatch(request_batch: List[Tuple[str, str, Dict]]) -> Set[str]:
+    """
+    Collect and store metadata for a batch of artworks on one worker thread.
+
+    Args:
+        request_batch: (illust_id, url, additional_headers) triples.
+
+    Returns:
+        Set[str]: always empty; metadata yields no image urls
+    """
+    for illust_id, url, additional_headers in request_batch:
+        collected_data = _collectMetadata(url, additional_headers=additional_headers)
+        if collected_data is not None:
+            metadata_store.enqueueSave(illust_id, METADATA_KIND, collected_data)
+    return set()
 
 
 class Collector:
@@ -25,105 +112,150 @@ class Collector:
         self.downloader = downloader
 
     def add(self, image_ids: Iterable[str]):
-        for image_id in image_ids:
-            self.id_group.add(image_id)
+        self.id_group.update(image_ids)
 
     def collect(self):
         """
         Collect all image ids in each artwork, and send to downloader
         NOTE: an artwork may contain multiple images
+
+        Page and metadata requests run interleaved on one thread pool, so the
+        elapsed time is that of the slower phase instead of their sum.
         """
-        with futures.ThreadPoolExecutor(download_config.num_threads + 1) as executor:
-            if download_config.with_tag:
-                # Submit the collect_metadata task to the executor
-                metadata_future = executor.submit(
-                    self.collect_metadata, selectMetadata, "metadata.json"
-                )
+        printInfo("===== Collector start =====")
+        printInfo("NOTE: An artwork may contain multiple images.")
+
+        # Freeze the id set once; set iteration re-hashes per pass and its
+        # order varies, while a tuple is iterated cheaply and predictably
+        ids = tuple(self.id_group)
+
+        request_phases = [(self._pageRequests(ids), _collectPageBatch)]
+        if download_config.with_tag:
+            request_phases.append((self._metadataRequests(ids), _collectMetadataBatch))
+
+        probe = None  # (worker function, number of artworks)
+        batches = []
+        for request_list, worker in request_phases:
+            if probe is None and request_list:
+                # Peel off a few requests as the inline latency probe
+                probe_batch = request_list[:_PROBE_SIZE]
+                probe = (functools.partial(worker, probe_batch), len(probe_batch))
+                request_list = request_list[_PROBE_SIZE:]
+            batch_size = _batchSize(len(request_list))
+            for i in range(0, len(request_list), batch_size):
+                batch = request_list[i : i + batch_size]
+                batches.append((functools.partial(worker, batch), len(batch)))
 
-            printInfo("===== Collector start =====")
-            printInfo("NOTE: An artwork may contain multiple images.")
-
-            with tqdm.trange(len(self.id_group), desc="Collecting urls") as pbar:
-                urls = [
-                    f"https://www.pixiv.net/ajax/illust/{illust_id}/pages?lang=zh"
-                    for illust_id in self.id_group
-                ]
-                additional_headers = [
-                    {
-                        "Referer": f"https://www.pixiv.net/artworks/{illust_id}",
-                        "x-user-id": user_config.user_id,
-                    }
-                    for illust_id in self.id_group
-                ]
-                url_futures = [
-                    executor.submit(collect, url, selectPage, headers)
-                    for url, headers in zip(urls, additional_headers)
-                ]
-                for future in futures.as_completed(url_futures):
-                    urls = future.result()
-                    if urls is not None:
-                        self.downloader.add(urls)
-                    pbar.update()
-
-            # Wait for the collect_metadata task to complete
-            futures.wait([metadata_future])
+        # The writer thread absorbs store writes so network workers never
+        # block on disk; stopWriter() flushes and joins it afterwards
+        metadata_store.startWriter()
+        try:
+            self._collectBatches(probe, batches)
+        finally:
+            metadata_store.stopWriter()
 
         printInfo("===== Collector complete =====")
         printInfo(f"Number of images: {len(self.downloader.url_group)}")
 
-    def collect_metadata(
-            self,
-            selector: Callable,
-            file_name: str,
+    def _collectBatches(
+        self, probe: Optional[Tuple[Callable, int]], batches: List[Tuple[Callable, int]]
     ):
         """
-        Collect data using the given selector and save it to a file.
+        Fan the prepared request batches out onto the thread pool and feed
+        collected urls to the downloader.
 
         Args:
-            selector: A function that selects the desired data from the artwork page.
-            file_name: The name of the file to save the data to.
+            probe: A small batch run inline first to calibrate the pool size.
+            batches: (worker function, number of artworks) pairs.
         """
-        printInfo(f"===== {file_name.capitalize()} collector start =====")
-
-        data: Dict[str, dict] = dict()
-        additional_headers = {"Referer": "https://www.pixiv.net/bookmark.php?type=user"}
-        collect_data_fn = functools.partial(
-            collect, selector=selector, additional_headers=additional_headers
-        )
-        with futures.ThreadPoolExecutor(download_config.num_threads) as executor:
-            # Filter out illust_ids for which the data file already exists
-            filtered_id_group = []
-            filtered_urls = []
-            for illust_id in self.id_group:
-                illust_dir = os.path.join(download_config.store_path, illust_id)
-                file_path = os.path.join(illust_dir, file_name)
-                if not os.path.exists(file_path):
-                    filtered_id_group.append(illust_id)
-                    filtered_urls.append(f"https://www.pixiv.net/artworks/{illust_id}")
-                else:
-                    printInfo(f"Data for illust_id {illust_id} already exists. Skipping.")
-
-            with tqdm.trange(len(filtered_id_group), desc=f"Collecting {file_name}") as pbar:
-                for illust_id, collected_data in zip(
-                        filtered_id_group,
-                        executor.map(
-                            collect_data_fn,
-                            filtered_urls,
-                        ),
-                ):
-                    if collected_data is not None:
-                        data[illust_id] = collected_data
-                        # Create directory for each illust_id
-                        illust_dir = os.path.join(download_config.store_path, illust_id)
-                        os.makedirs(illust_dir, exist_ok=True)
-
-                        # Save data to a file in the illust_id directory
-                        file_path = os.path.join(illust_dir, file_name)
-                        with open(file_path, "w", encoding="utf-8") as f:
-                            f.write(
-                                json.dumps(collected_data, indent=4, ensure_ascii=False)
-                            )
-                    pbar.update()
-
-        printInfo(f"===== {file_name.capitalize()} collector complete =====")
-        return data
+        num_total = sum(n for _, n in batches) + (probe[1] if probe is not None else 0)
+        with tqdm.tqdm(total=num_total, desc="Collecting") as pbar:
+            if probe is not None:
+                # Size the pool from the observed network before fanning out
+                fn, num_artworks = probe
+                start_time = time.time()
+                urls = fn()
+                latency = (time.time() - start_time) / num_artworks - download_config.thread_delay
+                calibratePoolSize(latency)
+                if urls:
+                    self.downloader.add(urls)
+                pbar.update(num_artworks)
+
+            # Keep a bounded window of futures in flight instead of
+            # materializing one future per batch up front
+            with futures.ThreadPoolExecutor(collectPoolSize()) as executor:
+                window_size = collectPoolSize() * 4
+                pending = collections.deque(batches)
+                inflight: Dict[futures.Future, int] = {}
+                done_count = 0
+                next_flush = time.monotonic() + _PBAR_FLUSH_INTERVAL
+                while pending or inflight:
+                    while pending and len(inflight) < window_size:
+                        fn, num_artworks = pending.popleft()
+                        inflight[executor.submit(fn)] = num_artworks
+                    done, _ = futures.wait(inflight, return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        urls = future.result()
+                        if urls:
+                            self.downloader.add(urls)
+                        done_count += inflight.pop(future)
+                    if done_count >= _PBAR_FLUSH_COUNT or time.monotonic() >= next_flush:
+                        pbar.update(done_count)
+                        done_count = 0
+                        next_flush = time.monotonic() + _PBAR_FLUSH_INTERVAL
+                if done_count > 0:
+                    pbar.update(done_count)
+
+    def _pageRequests(self, ids: Tuple[str, ...]) -> List[Tuple[str, str, Dict]]:
+        """
+        Build one pages request per uncached artwork; cached page urls are
+        sent straight to the downloader.
+
+        Returns:
+            List[Tuple[str, str, Dict]]: (illust_id, url, additional_headers)
+        """
+        page_requests = []
+        num_cached = 0
+        cached_ids = metadata_store.existingIds(PAGES_KIND)
+        header_template = {"Referer": "", "x-user-id": user_config.user_id}
+        for illust_id in ids:
+            cached_urls = _loadCachedPages(illust_id) if illust_id in cached_ids else None
+            if cached_urls is not None:
+                self.downloader.add(cached_urls)
+                num_cached += 1
+                continue
+            page_requests.append(
+                (
+                    illust_id,
+                    _PAGES_URL_PREFIX + illust_id + _PAGES_URL_SUFFIX,
+                    {**header_template, "Referer": _ARTWORK_URL_PREFIX + illust_id},
+                )
+            )
+        if num_cached > 0:
+            printInfo(f"Pages of {num_cached} artworks are cached. Skipping.")
+        return page_requests
+
+    def _metadataRequests(self, ids: Tuple[str, ...]) -> List[Tuple[str, str, Dict]]:
+        """
+        Build one artwork-page request per illust_id without stored metadata.
+
+        Returns:
+            List[Tuple[str, str, Dict]]: (illust_id, url, additional_headers)
+        """
+        metadata_requests = []
+        num_existing = 0
+        existing_ids = metadata_store.existingIds(METADATA_KIND)
+        for illust_id in ids:
+            if illust_id in existing_ids:
+                num_existing += 1
+                continue
+            metadata_requests.append(
+                (
+                    illust_id,
+                    _ARTWORK_URL_PREFIX + illust_id,
+                    dict(_METADATA_HEADERS),
+                )
+            )
+        if num_existing > 0:
+            printInfo(f"Metadata of {num_existing} artworks already exists. Skipping.")
+        return metadata_requests
@@ -1,11 +1,102 @@
+import threading
 import time
 from typing import Callable, Dict, Iterable, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from pixiv_utils.pixiv_crawler.config import debug_config, download_config, network_config
+from pixiv_utils.pixiv_crawler.config import (
+    DownloadConfig,
+    debug_config,
+    download_config,
+    network_config,
+)
 from pixiv_utils.pixiv_crawler.utils import assertWarn, printInfo, writeFailLog
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Rough budget (s) of network wait one artwork may cost; the calibrated pool
+# size keeps enough requests in flight to hide this latency
+LATENCY_BUDGET = 5.0
+MIN_POOL_SIZE = 4
+MAX_POOL_SIZE = 128
+
+_adaptive_pool_size: Optional[int] = None
+
+
+def collectPoolSize() -> int:
+    """
+    Concurrency used for the collect() fan-out.
+
+    Collecting urls/metadata is almost pure I/O wait (tiny JSON responses),
+    so it benefits from more in-flight requests than the download path;
+    the cap avoids opening an unreasonable number of sockets to pixiv.
+    """
+    if (
+        _adaptive_pool_size is not None
+        and download_config.num_threads == DownloadConfig.num_threads
+    ):
+        return _adaptive_pool_size
+    return min(32, download_config.num_threads * 4)
+
+
+def calibratePoolSize(latency: float):
+    """
+    Right-size the collect() fan-out from an observed per-request latency.
+
+    Slow networks get fewer in-flight requests (avoiding overload-induced
+    429s), fast ones get more. No-op when the user customized num_threads,
+    which then stays authoritative.
+
+    Args:
+        latency: Median seconds per request, excluding thread_delay.
+    """
+    global _adaptive_pool_size
+    if download_config.num_threads != DownloadConfig.num_threads:
+        return
+    _adaptive_pool_size = max(
+        MIN_POOL_SIZE, min(MAX_POOL_SIZE, int(LATENCY_BUDGET / max(latency, 0.05)))
+    )
+    if debug_config.verbose:
+        printInfo(f"Calibrated collector pool size: {_adaptive_pool_size}")
+
+
+def _getSession() -> requests.Session:
+    """
+    Return the shared requests.Session, creating it on first use.
+
+    The session keeps connections alive between requests, so the TCP/TLS
+    handshake is paid once per pooled connection instead of once per request.
+    NOTE: requests.Session is thread-safe for requests once its adapters are mounted.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            # Retries ride the warm keep-alive connections, so a retry
+            # costs a round trip instead of a fresh TLS handshake
+            # backoff_max keeps the worst case near the old
+            # retry_times * fail_delay budget instead of minutes of backoff
+            retry = Retry(
+                total=download_config.retry_times,
+                backoff_factor=0.5,
+                backoff_max=download_config.fail_delay,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+            )
+            # pool_maxsize is bookkeeping, not preallocation; cover the
+            # largest calibrated fan-out so keep-alive always applies
+            adapter = HTTPAdapter(
+                max_retries=retry,
+                pool_connections=collectPoolSize(),
+                pool_maxsize=MAX_POOL_SIZE,
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+    return _session
+
 
 def collect(
     url: str, selector: Callable, additional_headers: Optional[Dict]
@@ -19,7 +110,7 @@ def collect(
         args (Tuple[str, Callable, Optional[Dict]]): A tuple containing the URL, a selector function, and additional headers.
 
     """
-    headers = network_config.headers
+    headers = dict(network_config.headers)
     if additional_headers is not None:
         headers.update(additional_headers)
 
@@ -27,23 +118,23 @@ def collect(
         printInfo(f"Collecting {url}")
     time.sleep(download_config.thread_delay)
 
-    for i in range(download_config.retry_times):
-        try:
-            response = requests.get(
-                url, headers=headers, proxies=network_config.proxy, timeout=download_config.timeout
-            )
-
-            if response.status_code == requests.status_codes.codes.ok:
-                id_group = selector(response)
-                if debug_config.verbose:
-                    printInfo(f"{url} complete")
-                return id_group
+    # Retries (with backoff) are handled by the session adapter, see _getSession()
+    try:
+        response = _getSession().get(
+            url, headers=headers, proxies=network_config.proxy, timeout=download_config.timeout
+        )
 
-        except Exception as e:
-            assertWarn(not debug_config.show_error, e)
-            assertWarn(not debug_config.show_error, f"This is {i} attempt to collect {url}")
+        if response.status_code == requests.status_codes.codes.ok:
+            id_group = selector(response)
+            if debug_config.verbose:
+                printInfo(f"{url} complete")
+            return id_group
 
-            time.sleep(download_config.fail_delay)
+        assertWarn(
+            not debug_config.show_error, f"Unexpected status {response.status_code} from {url}"
+        )
+    except Exception as e:
+        assertWarn(not debug_config.show_error, e)
 
     assertWarn(not debug_config.show_error, f"Fail to collect {url}")
     writeFailLog(f"Fail to collect {url}.")
@@ -7,6 +7,7 @@ from requests.models import Response
 
 from pixiv_utils.pixiv_crawler.utils import writeFailLog
 
+
 def selectPage(response: Response) -> Set[str]:
     """
     Collect all image urls from (page.json)
@@ -82,7 +83,7 @@ def selectMetadata(response: Response) -> dict:
     """
     Collect tags, bookmarkCount and bookmarkData from (artwork.html)
     by combining selectTag and select_bookmark_data results
-    
+
     Sample url: https://www.pixiv.net/artworks/xxxxxx
 
     Returns:
@@ -103,4 +104,5 @@ def selectMetadata(response: Response) -> dict:
         "tags": [
             tag["translation"]["en"] if "translation" in tag else tag["tag"]
             for tag in content["illust"][illust_id]["tags"]["tags"]
-        ]}
+        ],
+    }
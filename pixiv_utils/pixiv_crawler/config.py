@@ -77,8 +77,9 @@ class DownloadConfig:
     with_tag: bool = True  # Whether to download tags to a separate json file
     url_only: bool = False  # Only download artwork urls
     num_threads: int = 12  # Number of parallel threads
+    batch_size: int = 20  # Max number of artworks collected per worker task
     thread_delay: float = 1  # Waiting time (s) after thread start
-    target_n: float  = 1
+    target_n: float = 1
 
 
 ranking_config = RankingConfig()
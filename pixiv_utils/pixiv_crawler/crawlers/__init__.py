@@ -1,7 +1,31 @@
-from .bookmark_crawler import BookmarkCrawler
-from .keyword_crawler import KeywordCrawler
-from .private_bookmark_crawler import PrivateBookmarkCrawler
-from .ranking_crawler import RankingCrawler
-from .users_crawler import UserCrawler
+import importlib
 
-__all__ = ["BookmarkCrawler", "PrivateBookmarkCrawler", "KeywordCrawler", "RankingCrawler", "UserCrawler"]
+# Lazy re-exports (PEP 562): importing one crawler should not pay the
+# transitive import cost (requests, bs4, tqdm) of the other four
+_CRAWLER_MODULES = {
+    "BookmarkCrawler": "bookmark_crawler",
+    "KeywordCrawler": "keyword_crawler",
+    "PrivateBookmarkCrawler": "private_bookmark_crawler",
+    "RankingCrawler": "ranking_crawler",
+    "UserCrawler": "users_crawler",
+}
+
+__all__ = [
+    "BookmarkCrawler",
+    "PrivateBookmarkCrawler",
+    "KeywordCrawler",
+    "RankingCrawler",
+    "UserCrawler",
+]
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _CRAWLER_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return getattr(importlib.import_module("." + module_name, __name__), name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -22,6 +22,10 @@ class BookmarkCrawler:
     Download images from user's public bookmarks
     """
 
+    # Overridden by PrivateBookmarkCrawler to crawl private bookmarks
+    rest = "show"
+    visibility = "public"
+
     def __init__(self, n_images: int = 200, capacity: float = 1024):
         """
         Args:
@@ -57,8 +61,8 @@ class BookmarkCrawler:
 
                 if response.status_code == requests.codes.ok:
                     n_total = 0
-                    publics = response.json()["body"]["public"]
-                    for tag in publics:
+                    bookmarks = response.json()["body"][self.visibility]
+                    for tag in bookmarks:
                         n_total += int(tag["cnt"])
                     self.n_images = min(self.n_images, n_total)
                     printInfo(f"Select {self.n_images}/{n_total} artworks")
@@ -87,7 +91,6 @@ class BookmarkCrawler:
         Args:
             artworks_per_json: Number of artworks per bookmark.json. Defaults to 48.
         """
-        # artworks_per_json = min(artworks_per_json, self.n_images)
         n_page = (self.n_images - 1) // artworks_per_json + 1  # ceil
         printInfo(f"===== Start collecting {self.uid}'s bookmarks =====")
 
@@ -101,7 +104,7 @@ class BookmarkCrawler:
                         f"tag=",
                         f"offset={i * artworks_per_json}",
                         f"limit={artworks_per_json}",
-                        f"rest=show",
+                        f"rest={self.rest}",
                         f"lang=zh",
                     ]
                 )
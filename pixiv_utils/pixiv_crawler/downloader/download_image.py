@@ -16,6 +16,7 @@ D = 0.05
 integral = 0
 last_error = 0
 
+
 def downloadImage(url: str, download_time: float = 10) -> float:
     """
     Download image from url
@@ -30,7 +31,7 @@ def downloadImage(url: str, download_time: float = 10) -> float:
     NOTE: The URL should be in the format "https://i.pximg.net/img-original/img/2022/05/11/00/00/12/98259515_p0.jpg"
     """
 
-    image_name = url[url.rfind("/") + 1:]
+    image_name = url[url.rfind("/") + 1 :]
     result = re.search(r"/(\d+)_", url)
     assertError(result is not None, "Bad url in image downloader")
     image_id = result.group(1)
@@ -42,6 +43,7 @@ def downloadImage(url: str, download_time: float = 10) -> float:
     time.sleep(download_config.thread_delay)
 
     image_path = os.path.join(download_config.store_path, image_id, image_name)
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
     if os.path.exists(image_path):
         assertWarn(not debug_config.verbose, f"{image_path} exists")
         return 0
@@ -67,7 +69,7 @@ def downloadImage(url: str, download_time: float = 10) -> float:
                     f.write(response.content)
                 if debug_config.verbose:
                     printInfo(f"{image_name} complete")
-                
+
                 # PID control
                 global integral, last_error
                 load_avg = os.getloadavg()[0]
@@ -77,10 +79,12 @@ def downloadImage(url: str, download_time: float = 10) -> float:
                 sleep_time = P * error + I * integral + D * derivative
                 last_error = error
                 if sleep_time > 0:
-                    printInfo(f"High load average detected: {load_avg}, sleeping for {sleep_time:.2f} seconds")
+                    printInfo(
+                        f"High load average detected: {load_avg}, sleeping for {sleep_time:.2f} seconds"
+                    )
                     time.sleep(sleep_time)
-                
-                return image_size / 2 ** 20
+
+                return image_size / 2**20
 
         except Exception as e:
             assertWarn(not debug_config.show_error, e)
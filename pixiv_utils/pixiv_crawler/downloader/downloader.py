@@ -26,8 +26,7 @@ class Downloader:
         self.capacity = capacity
 
     def add(self, urls: Iterable[str]):
-        for url in urls:
-            self.url_group.add(url)
+        self.url_group.update(urls)
 
     def download(self) -> Union[Set[str], float]:
         """
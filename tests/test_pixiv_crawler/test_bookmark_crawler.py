@@ -5,11 +5,12 @@ import unittest
 
 from pixiv_utils.pixiv_crawler import (
     BookmarkCrawler,
+    PrivateBookmarkCrawler,
     checkDir,
     debug_config,
     download_config,
     network_config,
-    user_config, PrivateBookmarkCrawler,
+    user_config,
 )
 
 
@@ -0,0 +1,91 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from pixiv_utils.pixiv_crawler import checkDir, download_config
+from pixiv_utils.pixiv_crawler.collector import collector, metadata_store
+from pixiv_utils.pixiv_crawler.collector.collector import PAGES_KIND, Collector
+from pixiv_utils.pixiv_crawler.downloader import Downloader
+
+
+class TestMetadataStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.root = "TEST_METADATA_STORE"
+        assert not os.path.exists(cls.root)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.root)
+
+    def setUp(self):
+        # A fresh store per test; metadata_store reopens on store_path change
+        download_config.store_path = os.path.join(self.root, self._testMethodName)
+        download_config.url_only = False
+
+    def test_round_trip(self):
+        data = {"tags": ["風景", "scenery"], "bookmarkCount": 3, "bookmarkData": None}
+        metadata_store.saveData("123", "metadata.json", data)
+        metadata_store.commit()
+        self.assertEqual(metadata_store.loadData("123", "metadata.json"), data)
+        self.assertIsNone(metadata_store.loadData("123", PAGES_KIND))
+        self.assertIsNone(metadata_store.loadData("456", "metadata.json"))
+        self.assertEqual(metadata_store.existingIds("metadata.json"), {"123"})
+
+    def test_read_does_not_create_store(self):
+        self.assertEqual(metadata_store.existingIds(PAGES_KIND), set())
+        self.assertIsNone(metadata_store.loadData("123", PAGES_KIND))
+        self.assertFalse(os.path.exists(download_config.store_path))
+
+    def test_writer_flushes_on_stop(self):
+        metadata_store.startWriter()
+        for illust_id in ("1", "2", "3"):
+            metadata_store.enqueueSave(illust_id, PAGES_KIND, [illust_id + "_p0.jpg"])
+        metadata_store.stopWriter()
+        self.assertEqual(metadata_store.existingIds(PAGES_KIND), {"1", "2", "3"})
+        self.assertEqual(metadata_store.loadData("2", PAGES_KIND), ["2_p0.jpg"])
+        # Without a running writer, enqueueSave must persist immediately
+        metadata_store.enqueueSave("4", PAGES_KIND, ["4_p0.jpg"])
+        self.assertEqual(metadata_store.loadData("4", PAGES_KIND), ["4_p0.jpg"])
+
+    def test_collect_skips_cached_pages(self):
+        download_config.with_tag = False
+
+        def fakePage(url, additional_headers=None):
+            illust_id = url.split("/ajax/illust/")[1].split("/")[0]
+            return {f"https://i.pximg.net/{illust_id}_p0.jpg"}
+
+        ids = [str(i) for i in range(40)]
+        first = Collector(Downloader(capacity=10))
+        first.add(ids)
+        with mock.patch.object(collector, "_collectPage", side_effect=fakePage) as collect_page:
+            first.collect()
+            self.assertEqual(collect_page.call_count, len(ids))
+        self.assertEqual(len(first.downloader.url_group), len(ids))
+
+        # Rerun: every artwork is served from the store, nothing is fetched
+        second = Collector(Downloader(capacity=10))
+        second.add(ids)
+        with mock.patch.object(collector, "_collectPage", side_effect=fakePage) as collect_page:
+            second.collect()
+            collect_page.assert_not_called()
+        self.assertEqual(second.downloader.url_group, first.downloader.url_group)
+
+    def test_url_only_leaves_store_untouched(self):
+        download_config.with_tag = False
+        download_config.url_only = True
+
+        checkDir(download_config.store_path)
+        app = Collector(Downloader(capacity=10))
+        app.add(["1", "2", "3"])
+        with mock.patch.object(
+            collector, "_collectPage", return_value={"https://i.pximg.net/1_p0.jpg"}
+        ):
+            app.collect()
+        self.assertEqual(len(app.downloader.url_group), 1)
+        self.assertEqual(len(os.listdir(download_config.store_path)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()